@@ -40,4 +40,5 @@ if ding.enable_linklink:  # False as default
 else:
     from .pytorch_ddp_dist_helper import get_rank, get_world_size, dist_mode, dist_init, dist_finalize, \
         allreduce, allreduce_with_indicator, broadcast, DDPContext, allreduce_async, synchronize, reduce_data, \
-        broadcast_object_list, to_ddp_config, allreduce_data
+        broadcast_object_list, to_ddp_config, allreduce_data, bucketed_allreduce, flush_allreduce, \
+        allreduce_async_bucket, broadcast_small_object
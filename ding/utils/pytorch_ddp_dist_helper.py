@@ -1,16 +1,24 @@
 from typing import Callable, Tuple, List, Any, Union
+from collections import defaultdict
 from easydict import EasyDict
 
 import os
+import pickle
 import numpy as np
 import torch
 import torch.distributed as dist
+from torch._utils import _flatten_dense_tensors, _unflatten_dense_tensors
 import datetime
 
-from .default_helper import error_wrapper
-
 # from .slurm_helper import get_master_addr
 
+# rank and world_size are immutable after ``dist_init``, so they are cached there to keep them off the hot path,
+# and cleared in ``dist_finalize``
+_RANK = None
+_WORLD_SIZE = None
+# the number of visible cuda devices, queried once in the first ``dist_init``
+_NUM_GPUS = None
+
 
 def get_rank() -> int:
     """
@@ -18,7 +26,12 @@ def get_rank() -> int:
         Get the rank of current process in total world_size
     """
     # return int(os.environ.get('SLURM_PROCID', 0))
-    return error_wrapper(dist.get_rank, 0)()
+    if _RANK is not None:
+        return _RANK
+    try:
+        return dist.get_rank()
+    except Exception:
+        return 0
 
 
 def get_world_size() -> int:
@@ -27,26 +40,213 @@ def get_world_size() -> int:
         Get the world_size(total process number in data parallel training)
     """
     # return int(os.environ.get('SLURM_NTASKS', 1))
-    return error_wrapper(dist.get_world_size, 1)()
+    if _WORLD_SIZE is not None:
+        return _WORLD_SIZE
+    try:
+        return dist.get_world_size()
+    except Exception:
+        return 1
 
 
 broadcast = dist.broadcast
 allgather = dist.all_gather
 broadcast_object_list = dist.broadcast_object_list
 
+# size of the reusable byte buffer in ``broadcast_small_object``, the first 8 bytes hold the payload length
+_BCAST_BUF_SIZE = 65536
+_BCAST_HEADER_SIZE = 8
+_BCAST_BUFFERS = {}
 
-def allreduce(x: torch.Tensor) -> None:
+
+def broadcast_small_object(obj: Any, src: int = 0) -> Any:
     """
     Overview:
-        All reduce the tensor ``x`` in the world
+        Broadcast a small picklable object from process ``src`` to all the processes. The pickled object is \
+        copied into a preallocated fixed-size byte buffer with its length in the header, so only one collective \
+        is issued instead of the size handshake and payload broadcast of ``broadcast_object_list``. Objects \
+        larger than the buffer fall back to ``broadcast_object_list``.
     Arguments:
-        - x (:obj:`torch.Tensor`): the tensor to be reduced
+        - obj (:obj:`Any`): the object to be broadcast, only used in process ``src``
+        - src (:obj:`int`): the source process
+    Returns:
+        - obj (:obj:`Any`): the object broadcast from process ``src``
+    """
+    if dist.get_backend() == 'nccl':
+        device = torch.device('cuda', torch.cuda.current_device())
+    else:
+        device = torch.device('cpu')
+    buf = _BCAST_BUFFERS.get(device)
+    if buf is None:
+        buf = torch.empty(_BCAST_BUF_SIZE, dtype=torch.uint8, device=device)
+        _BCAST_BUFFERS[device] = buf
+    header = buf[:_BCAST_HEADER_SIZE].view(torch.int64)
+
+    if get_rank() == src:
+        payload = pickle.dumps(obj)
+        n = len(payload)
+        if n <= _BCAST_BUF_SIZE - _BCAST_HEADER_SIZE:
+            payload = torch.from_numpy(np.frombuffer(bytearray(payload), dtype=np.uint8))
+            buf[_BCAST_HEADER_SIZE:_BCAST_HEADER_SIZE + n].copy_(payload)
+        else:
+            n = -1  # too large, tell the other processes to fall back
+        header.fill_(n)
+    dist.broadcast(buf, src=src)
+
+    n = header.item()
+    if n < 0:
+        objects = [obj]
+        dist.broadcast_object_list(objects, src=src)
+        return objects[0]
+    payload = buf[_BCAST_HEADER_SIZE:_BCAST_HEADER_SIZE + n].cpu().numpy().tobytes()
+    return pickle.loads(payload)
+
+
+# whether the initialized backend supports averaging inside the collective, lazily detected in ``_avg_op_supported``
+_AVG_OP_SUPPORTED = None
+
+
+def _avg_op_supported() -> bool:
+    """
+    Overview:
+        Check whether ``dist.ReduceOp.AVG`` can be used, which requires the nccl backend with NCCL >= 2.10. \
+        The result is cached after the first call since the backend won't change until the next ``dist_init``.
+    """
+    global _AVG_OP_SUPPORTED
+    if _AVG_OP_SUPPORTED is None:
+        _AVG_OP_SUPPORTED = False
+        # only query NCCL version on the nccl backend, since torch builds without NCCL don't provide it
+        if hasattr(dist.ReduceOp, 'AVG') and dist.get_backend() == 'nccl':
+            nccl_version = torch.cuda.nccl.version()
+            # old torch versions report NCCL version as a plain int, which predates ``ReduceOp.AVG`` support
+            _AVG_OP_SUPPORTED = isinstance(nccl_version, tuple) and nccl_version >= (2, 10)
+    return _AVG_OP_SUPPORTED
+
+
+def _check_avg_dtype(x: torch.Tensor) -> None:
     """
+    Overview:
+        Check that the tensor ``x`` can be averaged, i.e. it is floating point or complex. Integer tensors are \
+        rejected on all backends, because ``ReduceOp.AVG`` would silently truncate them while in-place ``div_`` raises.
+    Arguments:
+        - x (:obj:`torch.Tensor`): the tensor to be averaged
+    """
+    if not (x.is_floating_point() or x.is_complex()):
+        raise TypeError("average reduction needs floating point data, but got: {}".format(x.dtype))
+
 
+def _allreduce_avg(x: torch.Tensor, async_op: bool = False) -> Any:
+    """
+    Overview:
+        All reduce and average the tensor ``x`` in place. Use ``ReduceOp.AVG`` if supported to fuse the division \
+        into the collective, otherwise fall back to sum and ``div_``. Integer tensors are rejected, \
+        see ``_check_avg_dtype``.
+    Arguments:
+        - x (:obj:`torch.Tensor`): the tensor to be reduced
+        - async_op (:obj:`bool`): whether to launch the collective asynchronously, in which case the fallback \
+            path divides ``x`` before the collective
+    Returns:
+        - work (:obj:`Any`): the async work handle if ``async_op`` is True, otherwise None
+    """
+    _check_avg_dtype(x)
+    if _avg_op_supported():
+        return dist.all_reduce(x, op=dist.ReduceOp.AVG, async_op=async_op)
+    if async_op:
+        x.div_(get_world_size())
+        return dist.all_reduce(x, async_op=True)
     dist.all_reduce(x)
     x.div_(get_world_size())
 
 
+# tensors queued by ``defer=True`` calls, keyed by reduce op, and reduced together in ``flush_allreduce``
+_PENDING_ALLREDUCE = defaultdict(list)
+
+
+def allreduce(x: torch.Tensor, defer: bool = False) -> None:
+    """
+    Overview:
+        All reduce the tensor ``x`` in the world
+    Arguments:
+        - x (:obj:`torch.Tensor`): the tensor to be reduced
+        - defer (:obj:`bool`): whether to queue ``x`` and reduce it in the next ``flush_allreduce`` call, \
+            which coalesces all the queued tensors into a few bucketed collectives
+    """
+
+    if defer:
+        # check before queueing, so that invalid data fails here instead of being dropped in ``flush_allreduce``
+        _check_avg_dtype(x)
+        _PENDING_ALLREDUCE['avg'].append(x)
+        return
+    _allreduce_avg(x)
+
+
+def _split_buckets(tensors: List[torch.Tensor], bucket_mb: int) -> List[List[torch.Tensor]]:
+    """
+    Overview:
+        Group tensors by dtype and device, and split each group into buckets of at most ``bucket_mb`` MB, \
+        so that every bucket can be flattened into one contiguous buffer.
+    Arguments:
+        - tensors (:obj:`List[torch.Tensor]`): the tensors to be split
+        - bucket_mb (:obj:`int`): the maximum size (MB) of each bucket
+    Returns:
+        - buckets (:obj:`List[List[torch.Tensor]]`): the split buckets
+    """
+    bucket_bytes = bucket_mb * 1024 * 1024
+    groups = defaultdict(list)
+    for t in tensors:
+        groups[(t.dtype, t.device)].append(t)
+
+    buckets = []
+    for group in groups.values():
+        bucket, size = [], 0
+        for t in group:
+            t_bytes = t.numel() * t.element_size()
+            if len(bucket) > 0 and size + t_bytes > bucket_bytes:
+                buckets.append(bucket)
+                bucket, size = [], 0
+            bucket.append(t)
+            size += t_bytes
+        buckets.append(bucket)
+    return buckets
+
+
+def bucketed_allreduce(tensors: List[torch.Tensor], op: str = 'avg', bucket_mb: int = 25) -> None:
+    """
+    Overview:
+        All reduce a list of tensors in the world in place. Tensors are grouped by dtype and device, flattened \
+        into contiguous buckets of at most ``bucket_mb`` MB and each bucket is reduced by a single collective, \
+        which is much cheaper than one latency-bound collective per small tensor.
+    Arguments:
+        - tensors (:obj:`List[torch.Tensor]`): the tensors to be reduced
+        - op (:obj:`str`): the operation to perform on data, support ``['sum', 'avg']``
+        - bucket_mb (:obj:`int`): the maximum size (MB) of each flattened bucket
+    """
+
+    assert op in ['sum', 'avg'], op
+    for bucket in _split_buckets(tensors, bucket_mb):
+        flat = _flatten_dense_tensors(bucket)
+        if op == 'avg':
+            _allreduce_avg(flat)
+        else:
+            dist.all_reduce(flat)
+        for t, synced in zip(bucket, _unflatten_dense_tensors(flat, bucket)):
+            t.copy_(synced)
+
+
+def flush_allreduce(bucket_mb: int = 25) -> None:
+    """
+    Overview:
+        All reduce all the tensors queued by ``allreduce(x, defer=True)`` and ``allreduce_data(x, op, defer=True)``. \
+        All processes must call it at the same point after queueing the same tensors.
+    Arguments:
+        - bucket_mb (:obj:`int`): the maximum size (MB) of each flattened bucket
+    """
+
+    for op in list(_PENDING_ALLREDUCE.keys()):
+        tensors = _PENDING_ALLREDUCE.pop(op)
+        if len(tensors) > 0:
+            bucketed_allreduce(tensors, op, bucket_mb)
+
+
 def allreduce_with_indicator(grad: torch.Tensor, indicator: torch.Tensor) -> None:
     """
     Overview:
@@ -63,22 +263,138 @@ def allreduce_with_indicator(grad: torch.Tensor, indicator: torch.Tensor) -> Non
     dist.all_reduce(grad)
     dist.all_reduce(indicator)
 
-    # Avoid division by zero. If indicator is close to 0 (extreme case), grad remains zeros.
-    if not torch.isclose(indicator, torch.tensor(0.0)):
-        grad.div_(indicator.item())
+    # Avoid division by zero. If no process contributed (indicator is 0), grad is the sum of zeros and clamping
+    # the indicator to 1 keeps it zeros. This stays on device without any host synchronization.
+    grad.div_(indicator.clamp_min_(1.0))
 
 
-def allreduce_async(name: str, x: torch.Tensor) -> None:
+def allreduce_async(name: str, x: torch.Tensor) -> Any:
     """
     Overview:
         All reduce the tensor ``x`` in the world asynchronously
     Arguments:
         - name (:obj:`str`): the name of the tensor
         - x (:obj:`torch.Tensor`): the tensor to be reduced
+    Returns:
+        - work (:obj:`Any`): the async work handle, call ``work.wait()`` before reading ``x``
     """
 
-    x.div_(get_world_size())
-    dist.all_reduce(x, async_op=True)
+    return _allreduce_avg(x, async_op=True)
+
+
+class BucketAllreduceWork:
+    """
+    Overview:
+        The async work handle returned by ``allreduce_async_bucket``. Waiting on it waits for all the bucket \
+        collectives and copies the reduced results back into the original tensors.
+    Interfaces:
+        ``__init__``, ``wait``, ``is_completed``
+    """
+
+    def __init__(self, works: List[Any], flats: List[torch.Tensor], buckets: List[List[torch.Tensor]]) -> None:
+        """
+        Overview:
+            Initialize the ``BucketAllreduceWork``
+        Arguments:
+            - works (:obj:`List[Any]`): the async work handles of each bucket collective
+            - flats (:obj:`List[torch.Tensor]`): the flattened buffer of each bucket
+            - buckets (:obj:`List[List[torch.Tensor]]`): the original tensors of each bucket
+        """
+        self._works = works
+        self._flats = flats
+        self._buckets = buckets
+        self._done = False
+
+    def wait(self) -> None:
+        """
+        Overview:
+            Wait for all the bucket collectives and unflatten the results into the original tensors. \
+            Calling it more than once is a no-op.
+        """
+        if self._done:
+            return
+        for work, flat, bucket in zip(self._works, self._flats, self._buckets):
+            work.wait()
+            for t, synced in zip(bucket, _unflatten_dense_tensors(flat, bucket)):
+                t.copy_(synced)
+        self._done = True
+
+    def is_completed(self) -> bool:
+        """
+        Overview:
+            Check whether all the bucket collectives are completed, without blocking.
+        """
+        return all(work.is_completed() for work in self._works)
+
+
+def allreduce_async_bucket(tensors: List[torch.Tensor], bucket_mb: int = 25) -> BucketAllreduceWork:
+    """
+    Overview:
+        All reduce and average a list of tensors in the world asynchronously. Tensors are flattened into buckets \
+        as in ``bucketed_allreduce`` and one async collective is launched per bucket, so that communication \
+        can overlap with the following computation.
+    Arguments:
+        - tensors (:obj:`List[torch.Tensor]`): the tensors to be reduced
+        - bucket_mb (:obj:`int`): the maximum size (MB) of each flattened bucket
+    Returns:
+        - work (:obj:`BucketAllreduceWork`): the async work handle, call ``work.wait()`` before reading the tensors
+    """
+
+    works, flats, buckets = [], [], _split_buckets(tensors, bucket_mb)
+    for bucket in buckets:
+        flat = _flatten_dense_tensors(bucket)
+        works.append(_allreduce_avg(flat, async_op=True))
+        flats.append(flat)
+    return BucketAllreduceWork(works, flats, buckets)
+
+
+# preallocated 1-element device tensors used to reduce python scalars, keyed by (dtype, device index)
+_SCALAR_BUFFERS = {}
+# in-flight async collectives still reading the scalar buffers above, with the same keys
+_SCALAR_WORKS = {}
+# the dtype ``torch.as_tensor([x])`` infers for each scalar type, keyed by (scalar type, default dtype)
+_SCALAR_DTYPES = {}
+
+
+def _get_scalar_buffer(x: Union[int, float]) -> torch.Tensor:
+    """
+    Overview:
+        Get the cached 1-element staging tensor on the current cuda device and fill it with the scalar ``x``, \
+        so that scalar reduction doesn't allocate and copy a new cuda tensor every call.
+    Arguments:
+        - x (:obj:`Union[int, float]`): the scalar to be reduced
+    Returns:
+        - buf (:obj:`torch.Tensor`): the staging tensor filled with ``x``
+    """
+    dtype_key = (type(x), torch.get_default_dtype())
+    dtype = _SCALAR_DTYPES.get(dtype_key)
+    if dtype is None:
+        # keep the same dtype as the original ``torch.as_tensor([x])``, e.g. bool stays bool and np.float64 is
+        # not downcast, it only depends on the scalar type and the default dtype so it is inferred only once
+        dtype = torch.as_tensor([x]).dtype
+        _SCALAR_DTYPES[dtype_key] = dtype
+    key = (dtype, torch.cuda.current_device())
+    buf = _SCALAR_BUFFERS.get(key)
+    if buf is None:
+        buf = torch.empty(1, dtype=dtype, device='cuda')
+        _SCALAR_BUFFERS[key] = buf
+    work = _SCALAR_WORKS.pop(key, None)
+    if work is not None:
+        # don't overwrite the buffer before the previous async collective on it is finished
+        work.wait()
+    buf.fill_(x)
+    return buf
+
+
+def _wait_scalar_works() -> None:
+    """
+    Overview:
+        Wait for all the in-flight async scalar reductions left by ``reduce_data`` on non-dst processes, \
+        so that their errors are raised instead of being silently lost.
+    """
+    while len(_SCALAR_WORKS) > 0:
+        _, work = _SCALAR_WORKS.popitem()
+        work.wait()
 
 
 def reduce_data(x: Union[int, float, torch.Tensor], dst: int) -> Union[int, float, torch.Tensor]:
@@ -88,11 +404,21 @@ def reduce_data(x: Union[int, float, torch.Tensor], dst: int) -> Union[int, floa
     Arguments:
         - x (:obj:`Union[int, float, torch.Tensor]`): the tensor to be reduced
         - dst (:obj:`int`): the destination process
+
+    .. note::
+        For scalar ``x``, only process ``dst`` waits for the reduced result, the other processes return \
+        ``x`` unchanged immediately (numpy scalars are converted to python scalars) and let the reduction finish \
+        in the background. Call ``synchronize`` or ``dist_finalize`` to wait for these pending reductions.
     """
 
     if np.isscalar(x):
-        x_tensor = torch.as_tensor([x]).cuda()
-        dist.reduce(x_tensor, dst)
+        x_tensor = _get_scalar_buffer(x)
+        work = dist.reduce(x_tensor, dst, async_op=True)
+        if get_rank() != dst:
+            _SCALAR_WORKS[(x_tensor.dtype, x_tensor.device.index)] = work
+            # return a python scalar as ``.item()`` does on process ``dst``
+            return x.item() if isinstance(x, np.generic) else x
+        work.wait()
         return x_tensor.item()
     elif isinstance(x, torch.Tensor):
         dist.reduce(x, dst)
@@ -101,32 +427,51 @@ def reduce_data(x: Union[int, float, torch.Tensor], dst: int) -> Union[int, floa
         raise TypeError("not supported type: {}".format(type(x)))
 
 
-def allreduce_data(x: Union[int, float, torch.Tensor], op: str) -> Union[int, float, torch.Tensor]:
+def allreduce_data(x: Union[int, float, torch.Tensor], op: str, defer: bool = False) -> Union[int, float, torch.Tensor]:
     """
     Overview:
         All reduce the tensor ``x`` in the world
     Arguments:
         - x (:obj:`Union[int, float, torch.Tensor]`): the tensor to be reduced
         - op (:obj:`str`): the operation to perform on data, support ``['sum', 'avg']``
+        - defer (:obj:`bool`): whether to queue the tensor ``x`` and reduce it in the next ``flush_allreduce`` call, \
+            only supported for tensor input because the reduced scalar must be returned immediately
     """
 
     assert op in ['sum', 'avg'], op
+    if defer:
+        assert isinstance(x, torch.Tensor), "only tensor data can be deferred, but got: {}".format(type(x))
+        if op == 'avg':
+            _check_avg_dtype(x)
+        _PENDING_ALLREDUCE[op].append(x)
+        return x
     if np.isscalar(x):
-        x_tensor = torch.as_tensor([x]).cuda()
-        dist.all_reduce(x_tensor)
+        x_tensor = _get_scalar_buffer(x)
         if op == 'avg':
-            x_tensor.div_(get_world_size())
+            _allreduce_avg(x_tensor)
+        else:
+            dist.all_reduce(x_tensor)
         return x_tensor.item()
     elif isinstance(x, torch.Tensor):
-        dist.all_reduce(x)
         if op == 'avg':
-            x.div_(get_world_size())
+            _allreduce_avg(x)
+        else:
+            dist.all_reduce(x)
         return x
     else:
         raise TypeError("not supported type: {}".format(type(x)))
 
 
-synchronize = torch.cuda.synchronize
+def synchronize(device: Any = None) -> None:
+    """
+    Overview:
+        Wait for the pending async scalar reductions of ``reduce_data`` and then all the kernels on the cuda \
+        ``device``, the same as ``torch.cuda.synchronize``.
+    Arguments:
+        - device (:obj:`Any`): the device to synchronize, use the current device if None
+    """
+    _wait_scalar_works()
+    torch.cuda.synchronize(device)
 
 
 def get_group(group_size: int) -> List:
@@ -181,9 +526,14 @@ def dist_init(
             Default is 60000 seconds.
     """
 
+    global _AVG_OP_SUPPORTED, _RANK, _WORLD_SIZE, _NUM_GPUS
     assert backend in ['nccl', 'gloo'], backend
-    os.environ['MASTER_ADDR'] = addr or os.environ.get('MASTER_ADDR', "localhost")
-    os.environ['MASTER_PORT'] = port or os.environ.get('MASTER_PORT', "10314")  # hard-code
+    os.environ.update(
+        {
+            'MASTER_ADDR': addr or os.environ.get('MASTER_ADDR', "localhost"),
+            'MASTER_PORT': port or os.environ.get('MASTER_PORT', "10314"),  # hard-code
+        }
+    )
 
     if rank is None:
         local_id = os.environ.get('SLURM_LOCALID', os.environ.get('RANK', None))
@@ -199,11 +549,13 @@ def dist_init(
             world_size = int(ntasks)
 
     dist.init_process_group(backend=backend, rank=rank, world_size=world_size, timeout=timeout)
+    _AVG_OP_SUPPORTED = None
 
-    num_gpus = torch.cuda.device_count()
-    torch.cuda.set_device(rank % num_gpus)
-    world_size = get_world_size()
-    rank = get_rank()
+    if _NUM_GPUS is None:
+        _NUM_GPUS = torch.cuda.device_count()
+    torch.cuda.set_device(rank % _NUM_GPUS)
+    # ``init_process_group`` has succeeded with these values, so there is no need to query them again
+    _RANK, _WORLD_SIZE = rank, world_size
     return rank, world_size
 
 
@@ -212,9 +564,11 @@ def dist_finalize() -> None:
     Overview:
         Finalize distributed training resources
     """
+    global _AVG_OP_SUPPORTED, _RANK, _WORLD_SIZE
+    _wait_scalar_works()
     # This operation usually hangs out so we ignore it temporally.
     # dist.destroy_process_group()
-    pass
+    _AVG_OP_SUPPORTED, _RANK, _WORLD_SIZE = None, None, None
 
 
 class DDPContext:
@@ -260,15 +614,23 @@ def simple_group_split(world_size: int, rank: int, num_groups: int) -> List:
         - num_groups (:obj:`int`): The number of groups
 
     .. note::
-        With faulty input, raise ``array split does not result in an equal division``
+        If ``world_size`` is not divisible by ``num_groups``, raise ``ValueError``
     """
-    groups = []
-    rank_list = np.split(np.arange(world_size), num_groups)
-    rank_list = [list(map(int, x)) for x in rank_list]
-    for i in range(num_groups):
-        groups.append(dist.new_group(rank_list[i]))
+    if world_size % num_groups != 0:
+        raise ValueError('world_size({}) is not divisible by num_groups({})'.format(world_size, num_groups))
     group_size = world_size // num_groups
-    return groups[rank // group_size]
+    if hasattr(dist, 'new_subgroups') and world_size == dist.get_world_size() and rank == dist.get_rank():
+        # ``new_subgroups`` splits the default group, so it is only equivalent for the live world and rank
+        group, _ = dist.new_subgroups(group_size=group_size)
+        return group
+    # every rank must call ``new_group`` for all the groups, even for those it doesn't belong to
+    my_group_idx = rank // group_size
+    my_group = None
+    for i in range(num_groups):
+        group = dist.new_group(list(range(i * group_size, (i + 1) * group_size)))
+        if i == my_group_idx:
+            my_group = group
+    return my_group
 
 
 def to_ddp_config(cfg: EasyDict) -> EasyDict:
@@ -280,12 +642,16 @@ def to_ddp_config(cfg: EasyDict) -> EasyDict:
     """
 
     w = get_world_size()
+
+    def ceil_div(x: int) -> int:
+        return -(-int(x) // w)
+
     if 'batch_size' in cfg.policy:
-        cfg.policy.batch_size = int(np.ceil(cfg.policy.batch_size / w))
+        cfg.policy.batch_size = ceil_div(cfg.policy.batch_size)
     if 'batch_size' in cfg.policy.learn:
-        cfg.policy.learn.batch_size = int(np.ceil(cfg.policy.learn.batch_size / w))
+        cfg.policy.learn.batch_size = ceil_div(cfg.policy.learn.batch_size)
     if 'n_sample' in cfg.policy.collect:
-        cfg.policy.collect.n_sample = int(np.ceil(cfg.policy.collect.n_sample / w))
+        cfg.policy.collect.n_sample = ceil_div(cfg.policy.collect.n_sample)
     if 'n_episode' in cfg.policy.collect:
-        cfg.policy.collect.n_episode = int(np.ceil(cfg.policy.collect.n_episode / w))
+        cfg.policy.collect.n_episode = ceil_div(cfg.policy.collect.n_episode)
     return cfg
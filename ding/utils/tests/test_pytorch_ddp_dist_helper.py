@@ -0,0 +1,222 @@
+import socket
+
+import pytest
+import torch
+import torch.distributed as dist
+
+import ding.utils.pytorch_ddp_dist_helper as helper
+from ding.utils.pytorch_ddp_dist_helper import _split_buckets, bucketed_allreduce, flush_allreduce, allreduce, \
+    allreduce_data, broadcast_small_object, allreduce_async, allreduce_async_bucket, BucketAllreduceWork, \
+    dist_finalize, get_rank, get_world_size
+
+
+@pytest.fixture(scope='module')
+def gloo_group():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    dist.init_process_group('gloo', init_method='tcp://127.0.0.1:{}'.format(port), rank=0, world_size=1)
+    helper._AVG_OP_SUPPORTED = None
+    yield
+    dist.destroy_process_group()
+    helper._AVG_OP_SUPPORTED = None
+
+
+@pytest.fixture
+def fake_two_ranks(monkeypatch):
+    # simulate two processes holding the same data: sum doubles the tensor and average divides it by 2
+    calls = []
+
+    def fake_all_reduce(tensor, op=None, group=None, async_op=False):
+        calls.append(tensor.numel())
+        tensor.mul_(2)
+
+    monkeypatch.setattr(dist, 'all_reduce', fake_all_reduce)
+    monkeypatch.setattr(helper, 'get_world_size', lambda: 2)
+    yield calls
+    helper._PENDING_ALLREDUCE.clear()
+
+
+class FakeWork:
+
+    def __init__(self):
+        self.wait_count = 0
+
+    def wait(self):
+        self.wait_count += 1
+        return True
+
+    def is_completed(self):
+        return self.wait_count > 0
+
+
+@pytest.fixture
+def fake_async_two_ranks(monkeypatch):
+    # simulate an async reduction with another process holding zeros, so average halves the tensor
+    works = []
+
+    def fake_all_reduce(tensor, op=None, group=None, async_op=False):
+        work = FakeWork()
+        works.append(work)
+        return work if async_op else None
+
+    monkeypatch.setattr(dist, 'all_reduce', fake_all_reduce)
+    monkeypatch.setattr(helper, 'get_world_size', lambda: 2)
+    yield works
+
+
+@pytest.mark.unittest
+def test_split_buckets():
+    mb = 1024 * 1024
+    a = [torch.zeros(mb // 4) for _ in range(5)]  # 1 MB float32 each
+    b = torch.zeros(3, dtype=torch.int64)
+    big = torch.zeros(3 * mb // 4)
+    buckets = _split_buckets(a[:3] + [b] + a[3:] + [big], bucket_mb=2)
+    expected = [[a[0], a[1]], [a[2], a[3]], [a[4]], [big], [b]]
+    assert [[id(t) for t in bucket] for bucket in buckets] == [[id(t) for t in bucket] for bucket in expected]
+    assert _split_buckets([], bucket_mb=2) == []
+
+
+@pytest.mark.unittest
+def test_bucketed_allreduce(gloo_group):
+    tensors = [torch.randn(3, 4), torch.randn(5).double(), torch.arange(6).reshape(2, 3), torch.randn(7)]
+    origin = [t.clone() for t in tensors]
+    bucketed_allreduce(tensors, 'sum')
+    for t, o in zip(tensors, origin):
+        assert t.dtype == o.dtype and t.shape == o.shape
+        assert torch.equal(t, o)
+    float_tensors = [tensors[0], tensors[1], tensors[3]]
+    bucketed_allreduce(float_tensors, 'avg')
+    for t, o in zip(float_tensors, [origin[0], origin[1], origin[3]]):
+        assert torch.allclose(t, o)
+    with pytest.raises(TypeError):
+        bucketed_allreduce([tensors[2]], 'avg')
+
+
+@pytest.mark.unittest
+def test_bucketed_allreduce_copy_back(gloo_group, fake_two_ranks):
+    tensors = [torch.randn(3, 4), torch.randn(200000), torch.randn(5).double(), torch.randn(200000), torch.randn(7)]
+    origin = [t.clone() for t in tensors]
+    bucketed_allreduce(tensors, 'sum', bucket_mb=1)
+    # float32: [(3, 4), 200000], [200000, 7], float64: [5]
+    assert fake_two_ranks == [12 + 200000, 200000 + 7, 5]
+    for t, o in zip(tensors, origin):
+        assert t.shape == o.shape
+        assert torch.allclose(t, o * 2)
+    bucketed_allreduce(tensors, 'avg', bucket_mb=1)
+    for t, o in zip(tensors, origin):
+        assert torch.allclose(t, o * 2)
+
+
+@pytest.mark.unittest
+def test_flush_allreduce(gloo_group, fake_two_ranks):
+    x = torch.ones(3)
+    y = torch.ones(2, 2)
+    assert allreduce(x, defer=True) is None
+    assert allreduce_data(y, 'sum', defer=True) is y
+    with pytest.raises(AssertionError):
+        allreduce_data(3, 'sum', defer=True)
+    # integer data can't be averaged, it is rejected when queued rather than dropped in the flush
+    with pytest.raises(TypeError):
+        allreduce(torch.arange(3), defer=True)
+    with pytest.raises(TypeError):
+        allreduce_data(torch.arange(3), 'avg', defer=True)
+    assert len(helper._PENDING_ALLREDUCE['avg']) == 1 and len(helper._PENDING_ALLREDUCE['sum']) == 1
+    assert len(fake_two_ranks) == 0
+    assert torch.equal(x, torch.ones(3)) and torch.equal(y, torch.ones(2, 2))
+
+    flush_allreduce()
+    assert len(fake_two_ranks) == 2  # one bucket for each op
+    assert torch.equal(x, torch.ones(3))
+    assert torch.equal(y, torch.full((2, 2), 2.))
+    assert len(helper._PENDING_ALLREDUCE) == 0
+
+    flush_allreduce()
+    assert len(fake_two_ranks) == 2
+
+
+@pytest.mark.unittest
+def test_broadcast_small_object(gloo_group, monkeypatch):
+    fallback_calls = []
+    origin_broadcast_object_list = dist.broadcast_object_list
+
+    def spy_broadcast_object_list(*args, **kwargs):
+        fallback_calls.append(1)
+        return origin_broadcast_object_list(*args, **kwargs)
+
+    monkeypatch.setattr(dist, 'broadcast_object_list', spy_broadcast_object_list)
+
+    # the pickled payload contains zero bytes, which must not be mistaken for the end of data
+    small = [False, {'a': 0, 'b': [0, 1.5, None], 'c': b'\x00\x00'}]
+    assert broadcast_small_object(small, src=0) == small
+    # a smaller object after a larger one only reads its own length from the reused buffer
+    medium = {'data': b'\x01' * 50000}
+    assert broadcast_small_object(medium, src=0) == medium
+    assert broadcast_small_object(small, src=0) == small
+    assert len(fallback_calls) == 0
+
+    large = {'data': b'\x00' * 100000}
+    assert broadcast_small_object(large, src=0) == large
+    assert len(fallback_calls) == 1
+
+
+@pytest.mark.unittest
+def test_allreduce_async(gloo_group):
+    x = torch.randn(5)
+    origin = x.clone()
+    work = allreduce_async('x', x)
+    assert work is not None
+    work.wait()
+    assert work.is_completed()
+    assert torch.allclose(x, origin)
+
+
+@pytest.mark.unittest
+def test_allreduce_async_bucket(gloo_group):
+    tensors = [torch.randn(3, 4), torch.randn(5).double(), torch.randn(7)]
+    origin = [t.clone() for t in tensors]
+    work = allreduce_async_bucket(tensors)
+    assert isinstance(work, BucketAllreduceWork)
+    work.wait()
+    assert work.is_completed()
+    for t, o in zip(tensors, origin):
+        assert t.dtype == o.dtype and t.shape == o.shape
+        assert torch.allclose(t, o)
+    work.wait()
+    for t, o in zip(tensors, origin):
+        assert torch.allclose(t, o)
+
+
+@pytest.mark.unittest
+def test_allreduce_async_bucket_copy_back(gloo_group, fake_async_two_ranks):
+    tensors = [torch.randn(3, 4), torch.randn(5).double(), torch.randn(7)]
+    origin = [t.clone() for t in tensors]
+    work = allreduce_async_bucket(tensors)
+    assert len(fake_async_two_ranks) == 2  # one bucket for each dtype
+    assert not work.is_completed()
+    # the results are only copied back into the tensors in ``wait``
+    for t, o in zip(tensors, origin):
+        assert torch.equal(t, o)
+
+    work.wait()
+    assert work.is_completed()
+    assert all(w.wait_count == 1 for w in fake_async_two_ranks)
+    for t, o in zip(tensors, origin):
+        assert t.shape == o.shape
+        assert torch.allclose(t, o / 2)
+
+    # waiting again neither waits on the collectives nor copies the results again
+    tensors[0].zero_()
+    work.wait()
+    assert all(w.wait_count == 1 for w in fake_async_two_ranks)
+    assert torch.equal(tensors[0], torch.zeros(3, 4))
+
+
+@pytest.mark.unittest
+def test_dist_finalize_clears_cache(gloo_group, monkeypatch):
+    monkeypatch.setattr(helper, '_RANK', 3)
+    monkeypatch.setattr(helper, '_WORLD_SIZE', 4)
+    assert get_rank() == 3 and get_world_size() == 4
+    dist_finalize()
+    # fall back to the live default group
+    assert get_rank() == 0 and get_world_size() == 1
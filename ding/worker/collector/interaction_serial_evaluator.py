@@ -6,7 +6,7 @@ import torch
 from ding.envs import BaseEnvManager
 from ding.torch_utils import to_tensor, to_ndarray, to_item
 from ding.utils import build_logger, EasyTimer, SERIAL_EVALUATOR_REGISTRY
-from ding.utils import get_world_size, get_rank, broadcast_object_list
+from ding.utils import get_world_size, get_rank, broadcast_small_object
 from .base_serial_evaluator import ISerialEvaluator, VectorEvalMonitor
 
 
@@ -315,9 +315,7 @@ class InteractionSerialEvaluator(ISerialEvaluator):
                 )
 
         if get_world_size() > 1:
-            objects = [stop_flag, episode_info]
-            broadcast_object_list(objects, src=0)
-            stop_flag, episode_info = objects
+            stop_flag, episode_info = broadcast_small_object([stop_flag, episode_info], src=0)
 
         # Ensure episode_info is converted to the correct format
         episode_info = to_item(episode_info) if episode_info is not None else {}
@@ -354,10 +354,17 @@ class SampleSerialCollector(ISerialCollector):
         collected_duration = sum([d['time'] for d in self._episode_info])
         # reduce data when enables DDP
         if self._world_size > 1:
-            collected_sample = allreduce_data(collected_sample, 'sum')
-            collected_step = allreduce_data(collected_step, 'sum')
-            collected_episode = allreduce_data(collected_episode, 'sum')
-            collected_duration = allreduce_data(collected_duration, 'sum')
+            # pack the statistics into one tensor to reduce them with a single collective, float64 keeps the counts
+            # exact and the duration precise
+            collected_stat = torch.tensor(
+                [collected_sample, collected_step, collected_episode, collected_duration],
+                dtype=torch.float64,
+                device='cuda'
+            )
+            allreduce_data(collected_stat, 'sum')
+            collected_sample, collected_step, collected_episode, collected_duration = collected_stat.tolist()
+            collected_sample, collected_step, collected_episode = \
+                int(collected_sample), int(collected_step), int(collected_episode)
         self._total_envstep_count += collected_step
         self._total_episode_count += collected_episode
         self._total_duration += collected_duration